@@ -265,7 +265,8 @@ class TrackIndex(object):
       Empty string or :class:`_TrackTime` value that specifies the number of
       audio frames associated with the :class:`TrackIndex`. By default, this
       value will equal the total length of the WAV data, but might be truncated
-      if the track starts after, or ends before the WAV data.
+      if the track starts after, or ends before the WAV data. Set to
+      :data:`None` for :const:`INDEX` objects, which do not use the length.
 
    .. attribute:: num
 
@@ -276,15 +277,16 @@ class TrackIndex(object):
 
       :class:`_TrackTime` value that specifies the starting time index of the
       :class:`TrackIndex` object relative to the start of the audio data.
-      Usually this value is ``0``.
+      Usually this value is ``0``. Set to :data:`None` for :const:`START`
+      objects, which do not use the starting time.
    """
 
    #: Enum of valid :class:`TrackIndex` types.
    PREAUDIO, AUDIO, INDEX, START, DATA = list(range(5))
 
-   #: Integer set to :const:`PREAUDIO` or :const:`AUDIO` or :const:`INDEX` or
-   #: :const:`START`. Indicate the mode of :class:`TrackIndex` object.
-   cmd = AUDIO
+   # Instance attributes, no per-object __dict__ is created to reduce the
+   # memory used by discs with many indexes.
+   __slots__ = ('cmd', 'file_', 'len_', 'num', 'time')
 
    def __init__(self, num, time, file_, len_=None):
       """
@@ -305,6 +307,9 @@ class TrackIndex(object):
       :param len_:   Track length in format supported by :class:`_TrackTime`.
       :type  len_:   str, tuple, int (see :class:`_TrackTime`)
       """
+      #: Integer set to :const:`PREAUDIO` or :const:`AUDIO` or :const:`INDEX`
+      #: or :const:`START`. Indicate the mode of :class:`TrackIndex` object.
+      self.cmd    = self.AUDIO
       self.file_  = file_
       self.num    = int(num)
       self.time   = _TrackTime(time)
@@ -315,7 +320,7 @@ class TrackIndex(object):
          file_len = self._file_len(self.file_)
          if file_len: self.len_ = file_len - self.time
          else:        self.len_ = ''
-      log.debug( 'creating index %s' % repr(self) )
+      log.debug( 'creating index %r', self )
 
    def __repr__(self):
       """Return a string used for debug logging."""
@@ -331,11 +336,12 @@ class TrackIndex(object):
       if self.cmd == self.DATA:
          return ''     # do not output to TOC
       if self.cmd in [self.AUDIO, self.PREAUDIO]:
-         out += ['\tAUDIOFILE "%(file_)s" %(time)s %(len_)s' % self.__dict__]
+         out += ['\tAUDIOFILE "%s" %s %s' % (self.file_, self.time,
+                                               self.len_)]
       elif self.cmd == self.INDEX:
-         out += ['\tINDEX %(time)s' % self.__dict__]
+         out += ['\tINDEX %s' % (self.time,)]
       elif self.cmd == self.START:
-         out += ['\tSTART %(len_)s' % self.__dict__]
+         out += ['\tSTART %s' % (self.len_,)]
       else: raise Exception
       # add start command for pregap audio
       if self.cmd == self.PREAUDIO:
@@ -374,10 +380,10 @@ class _TrackTime(object):
    #: Defines the number of audio *Frames Per Minute*
    _FPM = _FPS * _SPM
 
-   #: :class:`tuple` that stores the minutes, seconds, and frames values. The
-   #: combination of these values can be used to calculate the total frame
-   #: count.
-   _time = None
+   # :class:`tuple` that stores the minutes, seconds, and frames values. The
+   # combination of these values can be used to calculate the total frame
+   # count. No per-object __dict__ is created.
+   __slots__ = ('_time',)
 
    def __init__(self, arg=None):
       """Initializes the :class:`_TrackTime` object, normalizing the input
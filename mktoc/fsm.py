@@ -27,15 +27,19 @@ class StateMachine(object):
 
    The state machine is controled by two externally provided data structures.
 
-   .. attribute:: regex_obj
+   .. attribute:: cmd_regexes
 
-      A compiled :mod:`regex <re>` pattern instance that contains one or more
-      named groups (i.e. ``(?P<name>...)``) sub-patterns.
+      A :class:`dict` that maps the keyword at the start of each line of
+      text to a compiled :mod:`regex <re>` pattern instance. The
+      pattern is matched against the text following the keyword, and the
+      groups of a successful match are passed to the handler function.
 
    .. attribute:: match_handlers
 
-      A :class:`dict` that maps a handler function to a group name returned by
-      a successful match in the :data:`regex_obj` instance.
+      A :class:`dict` that maps a handler function to the keyword at the
+      start of each line of text.
+
+   Keywords are matched exactly as written, including case.
 
    .. warning::
 
@@ -45,43 +49,51 @@ class StateMachine(object):
    .. Document private members
    .. automethod:: __call__
    """
-   __regex_obj = None
+   __cmd_regexes = None
    __match_handlers = None
 
    def __call__(self,lines):
       """
-      For each line of text in :data:`lines`, a regex match is performed
-      and a state handler function is called to finalize processing of the
-      string.
+      For each line of text in :data:`lines`, the leading keyword is used to
+      select a regex pattern and a state handler function. The regex match is
+      performed on the remaining text and the state handler function is called
+      to finalize processing of the string.
 
       :param lines: Input data consumed by state machine
       :type  lines: list
       """
+      # a single split and dict lookup selects the command; this is faster
+      # than testing each keyword with str.startswith()
       for l in lines:
-         match = self.__regex_obj.match(l)
+         words = l.split(None,1)
+         keyword = words[0] if words else ''
+         handler = self.__match_handlers.get(keyword)
+         regex = self.__cmd_regexes.get(keyword)
+         # match the text after the keyword, which may follow white space
+         match = handler and regex and \
+                  regex.match(l, l.index(keyword) + len(keyword))
          if match:
-            match_name = match.lastgroup
-            match_groups = [x for x in match.groups() if x]
-            self.__match_handlers[match_name]( match_name, *match_groups)
+            handler( keyword, l, *match.groups())
          else:
             raise NullStateException(repr(l))
 
-   def change_state(self,regex_obj=None,match_handlers=None):
+   def change_state(self,cmd_regexes=None,match_handlers=None):
       """
       Modifies the control flow of the state machine.
 
-      Replaces the internal :data:`regex_obj` or :data:`match_handlers`.
+      Replaces the internal :data:`cmd_regexes` or :data:`match_handlers`.
       Using keywords, one paramter can be changed without effecting the other.
 
-      :param regex_obj: Compiled regular expression object
-      :type  regex_obj: :ref:`regex <re-objects>`
+      :param cmd_regexes: Compiled regular expression objects, keyed with the
+                          command keyword.
+      :type  cmd_regexes: :class:`dict` of :ref:`regex <re-objects>`\'s
 
-      :param match_handlers: handler functions map, keyed with
-                             :data:`regex_obj` group name.
+      :param match_handlers: handler functions map, keyed with the command
+                             keyword.
       :type  match_handlers: :class:`dict` of :func:`callable`\'s
       """
-      if regex_obj:
-         self.__regex_obj = regex_obj
+      if cmd_regexes:
+         self.__cmd_regexes = cmd_regexes
       if match_handlers:
          self.__match_handlers = match_handlers
 
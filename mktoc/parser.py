@@ -22,10 +22,13 @@
 
 
 from itertools import *
+import chardet.universaldetector
+import codecs
+import functools
 import logging
-import operator as op
 import os
 import re
+import sys
 
 from .base import *
 from . import disc
@@ -76,13 +79,9 @@ class ParseData(object):
       """
       Access method to return a text stream of the CUE data in TOC format.
       """
-      toc = []
-      toc.extend( str(self.disc).split('\n') )
-      for trk in self._tracks:
-         toc.extend( str(trk).split('\n') )
+      toc = '\n'.join( chain([str(self.disc)], map(str,self._tracks)) )
       # expand tabs to 4 spaces, strip trailing white space on each line
-      toc = [line.expandtabs(4).rstrip() for line in toc]
-      return toc
+      return [line.rstrip() for line in toc.expandtabs(4).split('\n')]
 
    def modWavOffset(self,samples,tmp=False):
       """
@@ -107,12 +106,12 @@ class ParseData(object):
       new_files = wo( self._files, tmp )
 
       # change all index file names to newly generated files
-      file_map = dict( list(zip(self._files,new_files)) )
-      indexes = map(op.attrgetter('indexes'), self._tracks);
-      for idx in chain(*indexes):
-         if idx.file_: # data tracks do not have valid files
-            log.debug( "updating index file '%s'", idx.file_ )
-            idx.file_ = file_map[idx.file_]
+      new_file = dict( zip(self._files,new_files) ).__getitem__
+      for trk in self._tracks:
+         for idx in trk.indexes:
+            if idx.file_: # data tracks do not have valid files
+               log.debug( "updating index file '%s'", idx.file_ )
+               idx.file_ = new_file(idx.file_)
 
 
 class _FileLookup(object):
@@ -132,9 +131,9 @@ class _FileLookup(object):
    # exception is raised.
    _find_wav         = None
 
-   # WavFileCache object that can quickly find WAV files in the local file
-   # system.
-   _wav_file_cache   = None
+   # True or false, when True the process wide WAV file caches have already
+   # been cleared by this object, and are known to match the file system.
+   _refreshed        = None
 
    def __init__(self, dir_, find_wav):
       """
@@ -153,77 +152,167 @@ class _FileLookup(object):
       self._dir            = dir_
       self._find_wav       = find_wav
       self._file_map       = {}
+      self._refreshed      = False
       assert(dir_)
-      self._wav_file_cache = wav.WavFileCache(dir_)
+      # relative file names are resolved from the cwd, so it is part of the
+      # key of the process wide caches
+      try:
+         self._cwd = os.getcwd()
+      except OSError:
+         self._cwd = None
 
    def __call__(self,file_):
       """
       :param file:   Audio file name parsed from the CUE text.
       :type  file:   string
       """
-      if file_ in self._file_map:
-         return self._file_map[file_]
-      else:
+      file_on_disk = self._file_map.get(file_)
+      if file_on_disk is None:
+         file_on_disk = self._lookup(file_)
+         self._file_map[file_] = file_on_disk
+      return file_on_disk
+
+   def _lookup(self, file_):
+      """
+      Find :attr:`file_` using the process wide WAV file caches. The caches
+      are cleared and the search is repeated once, if the file is not found
+      or the cached file no longer exists.
+
+      :param file:   Audio file name parsed from the CUE text.
+      :type  file:   string
+      """
+      while True:
          try:  # attempt to find the WAV file
-            file_on_disk = self._wav_file_cache(file_)
+            file_on_disk = _find_wav_file(self._cwd, self._dir, file_)
          except FileNotFoundError:
-            # raise only if '_find_wav' option is True
-            if self._find_wav: raise
-            else: file_on_disk = file_
-         self._file_map[file_] = file_on_disk
-         return file_on_disk
+            if self._refreshed:
+               # raise only if '_find_wav' option is True
+               if self._find_wav: raise
+               return sys.intern(file_)
+         else:
+            # DOS file paths are returned unchanged when the file exists
+            if (self._refreshed or
+                  os.path.exists(file_on_disk.replace('\\','/'))):
+               return file_on_disk
+         # the cached file system data is out of date, rescan
+         _find_wav_file.cache_clear()
+         _wav_file_cache.cache_clear()
+         self._refreshed = True
+
+
+@functools.lru_cache(maxsize=16)
+def _wav_file_cache(cwd, dir_):
+   """
+   Return a :class:`~mktoc.wav.WavFileCache` object that can quickly find WAV
+   files in the local file system. The object is shared by all lookups in
+   the same directory, so the file system is only scanned once until the
+   cache is cleared.
+
+   :param cwd:    Current working directory, used only to key the cache.
+   :type  cwd:    str
+
+   :param dir_:   Path location of the working directory.
+   :type  dir_:   str
+   """
+   return wav.WavFileCache(dir_)
+
+
+@functools.lru_cache(maxsize=4096)
+def _find_wav_file(cwd, dir_, file_):
+   """
+   Return the path of the WAV file on the system that matches :attr:`file_`.
+   Results are cached for all :class:`_FileLookup` objects, and must be
+   checked to still exist before use.
+
+   :param cwd:    Current working directory, used only to key the cache
+                  because relative file names are resolved from it.
+   :type  cwd:    str
+
+   :param dir_:   Path location of the working directory.
+   :type  dir_:   str
+
+   :param file_:  Audio file name parsed from the CUE text.
+   :type  file_:  str
+   """
+   # share one string object for every index that uses the file
+   return sys.intern(_wav_file_cache(cwd, dir_)(file_))
 
 
 class _CueStateMachine(fsm.StateMachine):
    """
    State machine logic for parsing CUE commands in a CUE file.
    """
-   #: Regex match pattern for CUE command syntax
-   CUE_CMDS = re.compile( r"""
-      (?P<catalog>
-         ^CATALOG             # CATALOG
-            \s+(\d{13})$) |   # value
-
-      (?P<flags>
-         ^FLAGS               # FLAG
-         \s+(.*)$) |          # one or more flags
-
-      (?P<file>
-         ^FILE                # FILE
-         \s+"(.*)"            # 'file name' in quotes
-         \s+WAVE$) |          # WAVE
-
-      (?P<index>
-         ^INDEX                        # INDEX
-         \s+(\d+)                      # 'index number'
-         \s+(\d{2}:\d{2}:\d{2})$) |    # 'index time'
-
-      (?P<isrc>
-         ^ISRC                # ISRC
-         \s+(.*)$) |          # value
-
-      (?P<performer>
-         ^PERFORMER           # PERFORMER
-         \s+"(.*)"$) |        # quoted string
-
-      (?P<pregap>
-         ^PREGAP              # PREGAP
-         \s+(.*)$) |          # value
-
-      (?P<title>
-         ^TITLE               # TITLE
-         \s+"(.*)"$) |        # quoted string
-
-      (?P<track>
-         ^TRACK                  # TRACK
-         \s+(\d+)                # track 'number'
-         \s+(AUDIO|MODE.*)$) |   # AUDIO or MODEx/xxxx
-
-      (?P<rem>
-         ^REM                 # REM
-         \s*(\w*)             # sub-keyword
-         \s*(.*))             # remaining text
-      """, re.VERBOSE)
+   # Regex pattern strings for CUE command arguments, keyed with the CUE
+   # command keyword.
+   _CUE_CMD_PATTERNS = {
+      'CATALOG'   : r'\s+([0-9]{13})$',                  # value
+      'FLAGS'     : r'\s+(.*)$',                         # one or more flags
+      'FILE'      : r'\s+"(.*)"'                         # 'file name' in quotes
+                    r'\s+WAVE$',                         # WAVE
+      'INDEX'     : r'\s+([0-9]+)'                       # 'index number'
+                    r'\s+([0-9]{2}:[0-9]{2}:[0-9]{2})$', # 'index time'
+      'ISRC'      : r'\s+(.*)$',                         # value
+      'PERFORMER' : r'\s+"(.*)"$',                       # quoted string
+      'PREGAP'    : r'\s+(.*)$',                         # value
+      'TITLE'     : r'\s+"(.*)"$',                       # quoted string
+      'TRACK'     : r'\s+([0-9]+)'                       # track 'number'
+                    r'\s+(AUDIO|MODE.*)$',               # AUDIO or MODEx/xxxx
+      'REM'       : r'\s*(\w*)'                          # sub-keyword
+                    r'\s*(.*)',                          # remaining text
+      }
+
+   #: Compiled regex match patterns for CUE command arguments, keyed with the
+   #: CUE command keyword. Each pattern is matched against the text following
+   #: the keyword. Numbers in CUE syntax are ASCII digits only, but white space
+   #: uses the same Unicode rules as the keyword split in the state machine.
+   CUE_CMDS = dict( (k, re.compile(v)) for k,v in _CUE_CMD_PATTERNS.items() )
+
+   # callback method names for 'DISC' state commands
+   _DISC_HANDLERS = {
+      'CATALOG'      : 'cmd_field_disc',
+      'FILE'         : 'cmd_file',
+      'PERFORMER'    : 'cmd_field_disc',
+      'REM'          : 'cmd_rem',
+      'TITLE'        : 'cmd_field_disc',
+      }
+   # callback method names for 'FILE' state commands
+   _FILE_HANDLERS = {
+      'FILE'         : 'cmd_file',
+      'INDEX'        : 'cmd_index',
+      'TRACK'        : 'cmd_track',
+      }
+   # callback method names for 'TRACK' state commands
+   _TRACK_HANDLERS = {
+      'FILE'         : 'cmd_file',
+      'FLAGS'        : 'cmd_flags',
+      'INDEX'        : 'cmd_index',
+      'ISRC'         : 'cmd_field_trk',
+      'PERFORMER'    : 'cmd_field_trk',
+      'PREGAP'       : 'cmd_field_trk',
+      'REM'          : 'cmd_noop',
+      'TITLE'        : 'cmd_field_trk',
+      'TRACK'        : 'cmd_track',
+      }
+
+   # set of supported FLAGS command values, and the track field names of any
+   # values that do not match the name of the field.
+   _TRACK_FLAGS = frozenset(('DCP','4CH','PRE'))
+   _FLAG_FIELDS = {'4CH':'four_ch'}
+
+   # Regex match pattern for the track index and length in the EAC log file
+   # track table.
+   _EAC_TRK_SIZE = re.compile(r'^\s+(\d+)\s+\|.+\|\s+(.+)\s+\|.+\|.+$')
+
+   # byte order marks of EAC log files, and the matching character encoding.
+   # Log files without a BOM are expected to be UTF-8.
+   _LOG_BOMS = ( (codecs.BOM_UTF8,        'utf-8-sig'),
+                 (codecs.BOM_UTF16_LE,    'utf-16'),
+                 (codecs.BOM_UTF16_BE,    'utf-16') )
+
+   # maximum number of bytes of an EAC log file used to detect the character
+   # encoding, and the size of each block fed to the detector.
+   _DETECT_SIZE  = 32*1024
+   _DETECT_CHUNK = 4*1024
 
    def __init__(self, file_lookup, dir_):
       """
@@ -237,48 +326,33 @@ class _CueStateMachine(fsm.StateMachine):
       .. Document private members
       .. automethod:: __call__
       """
-      # callback mapping for 'DISC' state commands
-      self.disc_handlers = {
-         'catalog'      : self.cmd_field_disc,
-         'file'         : self.cmd_file,
-         'performer'    : self.cmd_field_disc,
-         'rem'          : self.cmd_rem,
-         'title'        : self.cmd_field_disc,
-         }
-      # callback mapping for 'FILE' state commands
-      self.file_handlers = {
-         'file'         : self.cmd_file,
-         'index'        : self.cmd_index,
-         'track'        : self.cmd_track,
-         }
-      # callback mapping for 'TRACK' state commands
-      self.track_handlers = {
-         'file'         : self.cmd_file,
-         'flags'        : self.cmd_flags,
-         'index'        : self.cmd_index,
-         'isrc'         : self.cmd_field_trk,
-         'performer'    : self.cmd_field_trk,
-         'pregap'       : self.cmd_field_trk,
-         'rem'          : self.cmd_noop,
-         'title'        : self.cmd_field_trk,
-         'title'        : self.cmd_field_trk,
-         'track'        : self.cmd_track,
-         }
+      # callback mappings for 'DISC', 'FILE', and 'TRACK' state commands
+      self.disc_handlers  = self._bind_handlers(self._DISC_HANDLERS)
+      self.file_handlers  = self._bind_handlers(self._FILE_HANDLERS)
+      self.track_handlers = self._bind_handlers(self._TRACK_HANDLERS)
       # instance variables for managing parsing logic
       self.disc   = disc.Disc()
       self.tracks = []
       self.track  = None
       self.files  = []
       self.file_  = None
+      self._tracks_append = self.tracks.append
+      self._files_append  = self.files.append
+      self._prev_trk = None   # track before the current track
+      self._prev_idx = None   # last index added to the current track
       self.file_lookup = file_lookup
       self.dir_   = dir_
+      # EAC log file data track lengths, keyed by track index. Initialized
+      # on first use.
+      self._eac_sizes = None
+      self._detector = None   # character encoding detector, if needed
       # initialize beginning state
       self.change_state( self.CUE_CMDS, self.disc_handlers )
 
    def __call__(self,*a,**kw):
       """
-      Extends the super class method by catching 'KeyErrors' caused by
-      unexpected or unmatched patterns.
+      Extends the super class method by catching exceptions caused by
+      unexpected or unmatched commands.
       """
       try:
          super(_CueStateMachine,self).__call__(*a,**kw)
@@ -286,6 +360,16 @@ class _CueStateMachine(fsm.StateMachine):
          raise ParseError( 'Unknown/invalid command: ' + str(e) )
       return ParseData(self.disc, self.tracks, self.files)
 
+   def _bind_handlers(self, names):
+      """
+      Return a new callback mapping, with each method name in :data:`names`
+      replaced by the bound method of this instance.
+
+      :param names: method names keyed with the command name
+      :type  names: :class:`dict` of str\'s
+      """
+      return dict( (k,getattr(self,v)) for k,v in names.items() )
+
    def cmd_noop( self, match_name, cmd, *args ):
       """Ignored commands"""
 
@@ -307,15 +391,17 @@ class _CueStateMachine(fsm.StateMachine):
    def cmd_file( self, match_name, cmd, file_):
       """Process a new data file name. Changes state to 'FILE'."""
       self.file_ = self.file_lookup(file_)
-      self.files.append( self.file_ )
+      self._files_append( self.file_ )
       self.change_state( match_handlers=self.file_handlers )  # next state
 
    def cmd_track( self, match_name, cmd, trk_num, trk_type):
       """Create a new :class:`~mktoc.disc.Track` instance.
       Change state to 'TRACK'.
       """
+      self._prev_trk = self.track
+      self._prev_idx = None
       self.track = disc.Track(int(trk_num), trk_type != 'AUDIO')
-      self.tracks.append( self.track )
+      self._tracks_append( self.track )
       if trk_type != 'AUDIO':
          self.disc.is_multisession = True    # disc is multi-session
       self.change_state( match_handlers=self.track_handlers ) # next state
@@ -342,13 +428,11 @@ class _CueStateMachine(fsm.StateMachine):
 
       self.track.indexes.append( idx )
 
-      # set local var defaults
-      prev_idx = None
-      if len(self.track.indexes) >= 2:
-         prev_idx = self.track.indexes[-2] # [-1] is current index
-      prev_trk = None
-      if len(self.tracks) >= 2:
-         prev_trk = self.tracks[-2] # [-1] is current track
+      # set local vars to the previous index of the current track, and the
+      # previous track
+      prev_idx = self._prev_idx
+      prev_trk = self._prev_trk
+      self._prev_idx = idx
 
       # Add 'START' command after pregap audio file
       #
@@ -371,7 +455,7 @@ class _CueStateMachine(fsm.StateMachine):
             #           'START', and the length of the pregap must be set.
             idx.cmd = disc.TrackIndex.START
             idx.len_ = idx.time - prev_idx.time
-            del idx.time # remove for safety, do not use
+            idx.time = None   # not used by START
          else:
             # Else not a pregap, change the TOC command for a new track to
             # 'INDEX' when a single logical 'track' has multiple index values
@@ -384,60 +468,98 @@ class _CueStateMachine(fsm.StateMachine):
             #           instead of AUDIOFILE. No other calculations are
             #           needed because INDEX is specified by file offset.
             idx.cmd = disc.TrackIndex.INDEX
-            del idx.len_ # remove for safety, do not use
+            idx.len_ = None   # not used by INDEX
 
       # Set the LENGTH argument on a track fle that must stop before EOF
       #
       # On the current index, which is the first index of track 2 or
       # greater,
-      if prev_trk and len(self.track.indexes) == 1:
-         for prev_idx in prev_trk.indexes:
+      if prev_trk and prev_idx is None:
+         # more than one AUDIOFILE index of the previous track can use the
+         # current file, when files are interleaved within the track.
+         for trk_idx in reversed(prev_trk.indexes):
             # if TOC command for previous track index is AUDIOFILE, and if prev
             # track uses the same file, then prev INDEX must end before the
             # current track INDEX starts.
-            if (prev_idx.cmd == disc.TrackIndex.AUDIO
-                  and prev_idx.file_ == self.file_):
-               prev_idx.len_ = idx.time - prev_idx.time
+            if (trk_idx.file_ == self.file_
+                  and trk_idx.cmd == disc.TrackIndex.AUDIO):
+               trk_idx.len_ = idx.time - trk_idx.time
 
    def cmd_flags( self, match_name, cmd, flags):
       """Set the state of flag fields in a :class:`disc.Track` instance."""
-      for f in [x for x in flags.split() if x in ['DCP','4CH','PRE']]:
-         if f == '4CH': f = 'four_ch'     # change '4CH' flag name
-         self.track.set_field(f,True)
+      for f in flags.split():
+         if f in self._TRACK_FLAGS:
+            self.track.set_field( self._FLAG_FIELDS.get(f,f), True)
 
    def data_trk_size(self, trk_idx):
       """
       Use an ExactAudioCopy log file to determine the length of the track at
-      the specified index.
+      the specified index. The log files are only read on the first call.
 
       :param trk_idx: Track index of data
       :type  trk_idx: int
       """
-      import codecs
-      import chardet.universaldetector
-      size = None
+      if self._eac_sizes is None:
+         self._eac_sizes = self._read_eac_logs()
+      return self._eac_sizes.get(trk_idx)
+
+   def _read_eac_logs(self):
+      """
+      Return a :class:`dict` of track lengths, keyed with the track index,
+      found in all of the ExactAudioCopy log files in the working directory.
+      If a track is found in more than one log file, the first log file in
+      sorted order is used.
+      """
+      sizes = {}
       files = os.listdir(self.dir_)
       logs = [f for f in files if os.path.splitext(f)[1] == '.log']
       logs.sort()
       for f in logs:
-         # detect file character encoding
          with open(os.path.join(self.dir_,f),'rb') as fh:
-            d = chardet.universaldetector.UniversalDetector()
-            for line in fh.readlines():
-               d.feed(line)
-            d.close()
-            encoding = d.result['encoding']
-         with codecs.open( os.path.join(self.dir_,f),
-                           'rb', encoding=encoding) as fh:
-            lines = fh.readlines()
-         regex = re.compile(r'^\s+%d\s+\|.+\|\s+(.+)\s+\|.+\|.+$' % (trk_idx,))
-         matches = [_f for _f in map(regex.match,lines) if _f]
-         if matches:
-            # convert first match from '1:11.11' to '1:11:11'
-            size = matches[0].group(1).replace('.',':')
-            break
-
-      return size
+            raw = fh.read()
+         lines = self._decode_log(raw).splitlines()
+         for match in filter(None, map(self._EAC_TRK_SIZE.match,lines)):
+            # keep first match, convert from '1:11.11' to '1:11:11'
+            sizes.setdefault( int(match.group(1)),
+                              match.group(2).replace('.',':') )
+      return sizes
+
+   def _decode_log(self, raw):
+      """
+      Return the text of an EAC log file. The character encoding is selected
+      by the byte order mark, or is assumed to be UTF-8. The encoding is only
+      detected from the data if it can not be decoded.
+
+      :param raw: Undecoded contents of the log file
+      :type  raw: bytes
+      """
+      for bom,encoding in self._LOG_BOMS:
+         if raw.startswith(bom): break
+      else:
+         encoding = 'utf-8'
+      try:
+         return raw.decode(encoding)
+      except UnicodeDecodeError:
+         encoding = self._log_encoding(raw)
+         return raw.decode(encoding or 'utf-8', 'replace')
+
+   def _log_encoding(self, raw):
+      """
+      Return the character encoding of an EAC log file, detected using the
+      first :attr:`_DETECT_SIZE` bytes of data.
+
+      :param raw: Undecoded contents of the log file
+      :type  raw: bytes
+      """
+      if self._detector is None:
+         self._detector = chardet.universaldetector.UniversalDetector()
+      d = self._detector
+      d.reset()
+      for i in range(0, min(len(raw),self._DETECT_SIZE), self._DETECT_CHUNK):
+         d.feed(raw[i:i+self._DETECT_CHUNK])
+         if d.done: break
+      d.close()
+      return d.result['encoding']
 
 
 class CueParser(object):
@@ -472,13 +594,14 @@ class CueParser(object):
 
       :returns: :class:`ParseData` instance that mirrors the CUE data.
       """
-      # parse disc into memory, ignore comments
-      cue = [line.strip() for line in fh]
-      if not len(cue):
+      # stream the stripped disc lines, ignore blank lines
+      cue = (line for line in (l.strip() for l in fh) if line)
+      first = next(cue, None)
+      if first is None:
          raise EmptyCueData
       # begin state machine in 'Init' state
       csm = _CueStateMachine(self.file_lookup, self.dir_)
-      return csm( cue )
+      return csm( chain([first], cue) )
 
 
 class WavParser(object):
@@ -510,16 +633,13 @@ class WavParser(object):
 
       :returns: :class:`ParseData` instance that mirrors the WAV data.
       """
-      files = list(map(self.file_lookup, wav_files))
-      # return a new Track object with a single Index using 'file_'
-      def mk_track(tuple):
-         (idx,file_) = tuple
-         # create a new track for the WAV file
-         trk = disc.Track(idx+1)
-         # add the WAV file to the first index in the track
+      files = [self.file_lookup(f) for f in wav_files]
+      # create a new track for each WAV file, and add the WAV file to the
+      # first index in the track
+      tracks = []
+      for num,file_ in enumerate(files,1):
+         trk = disc.Track(num)
          trk.indexes.append( disc.TrackIndex(1,0,file_) )
-         return trk
+         tracks.append( trk )
       # return a new ParseData object with empy Disc and complete Track list
-      return ParseData( disc.Disc(),
-                        list(map( mk_track, enumerate(files))), files )
-
+      return ParseData( disc.Disc(), tracks, files )
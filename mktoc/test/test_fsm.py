@@ -0,0 +1,62 @@
+#  Copyright (c) 2011, Patrick C. McGinty
+#
+#  This program is free software: you can redistribute it and/or modify it
+#  under the terms of the Simplified BSD License.
+#
+#  See LICENSE text for more details.
+"""
+   Unit testing framework for mktoc_fsm module.
+"""
+
+import re
+import unittest
+
+from mktoc.fsm import *
+
+
+##############################################################################
+class StateMachineTests(unittest.TestCase):
+   """Unit tests for the external interface of the StateMachine class."""
+   _CMDS = { 'TITLE' : re.compile(r'\s+"(.*)"$'),
+             'TRACK' : re.compile(r'\s+(\d+)$') }
+
+   def setUp(self):
+      self.calls = []
+      self.sm = StateMachine()
+      self.sm.change_state( self._CMDS, {'TITLE': self._handler} )
+
+   def _handler(self, name, line, *args):
+      self.calls.append( (name, line, args) )
+
+   def testMatch(self):
+      """A known keyword must call the handler with the match groups."""
+      self.sm(['TITLE "x"'])
+      self.assertEqual( self.calls, [('TITLE', 'TITLE "x"', ('x',))] )
+
+   def testLeadingWhiteSpace(self):
+      """White space before the keyword must be ignored."""
+      self.sm(['  TITLE "x"'])
+      self.assertEqual( self.calls, [('TITLE', '  TITLE "x"', ('x',))] )
+
+   def testCaseSensitiveKeyword(self):
+      """Keywords must be matched exactly as written."""
+      self.assertRaises( NullStateException, self.sm, ['title "x"'] )
+
+   def testNoHandler(self):
+      """A keyword without a handler in the current state must fail."""
+      self.assertRaises( NullStateException, self.sm, ['TRACK 1'] )
+
+   def testNoRegex(self):
+      """A handler keyword without a regex must fail."""
+      self.sm.change_state( match_handlers={'ISRC': self._handler} )
+      self.assertRaises( NullStateException, self.sm, ['ISRC x'] )
+
+   def testBlankLine(self):
+      """A blank line must fail."""
+      self.assertRaises( NullStateException, self.sm, ['  '] )
+
+
+##############################################################################
+if __name__ == '__main__':
+   """Execute all test cases define in this file."""
+   unittest.main()
@@ -8,13 +8,18 @@
    Unit testing framework for mktoc_paraser module.
 """
 
+import codecs
 import inspect
 import os
+import shutil
 import sys
+import tempfile
 import unittest
+import wave
 
 from mktoc.base import *
 from mktoc.parser import *
+from mktoc.parser import _CueStateMachine
 from mktoc.disc import *
 from mktoc.cmdline import CommandLine
 
@@ -149,6 +154,47 @@ class CueParserTests(unittest.TestCase):
       self.assertRaisesRegex(
          ParseError, ".+: '%s'" % (file_[2],), cp.parse, file_)
 
+   def testParseTrack_UnexpectedCmd(self):
+      cp = CueParser(find_wav=False)
+      file_ = ['FILE "track1.wav" WAVE',
+         'TRACK 01 AUDIO',
+         'CATALOG 0000000000000',]
+      self.assertRaisesRegex(
+         ParseError, ".+: '%s'" % (file_[2],), cp.parse, file_)
+
+   def testParseDisc_LowerCaseCmd(self):
+      cp = CueParser()
+      file_ = ['title "album"']
+      self.assertRaisesRegex(
+         ParseError, ".+: '%s'" % (file_[0],), cp.parse, file_)
+
+   def testInterleavedFileLength(self):
+      """Every AUDIOFILE index of a track that uses the same file as the next
+      track must end before the next track starts."""
+      cp = CueParser(find_wav=False)
+      file_ = ['FILE "track-alpha.wav" WAVE',
+         'TRACK 01 AUDIO',
+         'INDEX 01 00:00:00',
+         'FILE "track-beta.wav" WAVE',
+         'INDEX 02 00:00:00',
+         'FILE "track-alpha.wav" WAVE',
+         'INDEX 03 00:10:00',
+         'TRACK 02 AUDIO',
+         'INDEX 01 00:20:00',]
+      toc = cp.parse(file_).getToc()
+      self.assertIn( '    AUDIOFILE "track-alpha.wav" 00:00:00 00:20:00', toc)
+      self.assertIn( '    AUDIOFILE "track-alpha.wav" 00:10:00 00:10:00', toc)
+
+   def testUnicodeWhiteSpace(self):
+      """Any white space that separates the command keyword must also be
+      accepted between command arguments."""
+      cp = CueParser(find_wav=False)
+      file_ = ['TITLE\xa0"album"',
+         'FILE "track1.wav" WAVE',
+         'TRACK 01 AUDIO',
+         'INDEX 01\xa000:00:00',]
+      self.assertEqual( cp.parse(file_).disc.title, 'album')
+
    def testNoCueTracks(self):
       cp = CueParser()
       file_ = """REM GENRE Classical
@@ -167,6 +213,21 @@ class CueParserTests(unittest.TestCase):
          INDEX 00 08:08:18""".split('\n')
       self.assertTrue( cp.parse(file_) )
 
+   def testEmptyCue(self):
+      cp = CueParser()
+      file_ = ['', '   ', '']
+      self.assertRaises( EmptyCueData, cp.parse, file_)
+
+   def testIgnoreBlankLines(self):
+      cp = CueParser(find_wav=False)
+      file_ = """TITLE "album"
+
+         FILE "track1.wav" WAVE
+
+         TRACK 01 AUDIO
+         """.split('\n')
+      self.assertTrue( cp.parse(file_) )
+
    def testIgnoreRemCmd(self):
       cp = CueParser(find_wav=False)
       file_ = """REM COMMENT some unknown comment
@@ -177,6 +238,78 @@ class CueParserTests(unittest.TestCase):
       self.assertTrue( cp.parse(file_) )
 
 
+class CueParserFileCacheTests(unittest.TestCase):
+   """Unit tests for WAV file lookups that are cached across CueParser
+   objects. Files changed between two parses must be found."""
+   def setUp(self):
+      self.dir_ = tempfile.mkdtemp()
+
+   def tearDown(self):
+      shutil.rmtree(self.dir_)
+
+   def _mk_wav(self, name):
+      """Create an empty WAV file in the test dir."""
+      path = os.path.join(self.dir_, name)
+      if not os.path.exists(os.path.dirname(path)):
+         os.makedirs(os.path.dirname(path))
+      w = wave.open(path, 'w')
+      w.setparams((2, 2, 44100, 0, 'NONE', None))
+      w.close()
+      return path
+
+   def _parse_file(self, name):
+      """Return the file of the first index in a single track CUE."""
+      file_ = ['FILE "%s" WAVE' % name, 'TRACK 01 AUDIO', 'INDEX 01 00:00:00']
+      data = CueParser(self.dir_, find_wav=True).parse(file_)
+      return data._tracks[0].indexes[0].file_
+
+   def testAddedFile(self):
+      self._mk_wav('a/track-alpha.wav')
+      self._parse_file('track-alpha.wav')
+      path = self._mk_wav('b/track-beta.wav')
+      self.assertEqual( self._parse_file('track-beta.wav'), path)
+
+   def testRenamedFile(self):
+      old = self._mk_wav('a/track-alpha.wav')
+      self.assertEqual( self._parse_file('track-alpha.wav'), old)
+      new = os.path.join(self.dir_, 'a', 'track-alpha renamed.wav')
+      os.rename(old, new)
+      self.assertEqual( self._parse_file('track-alpha.wav'), new)
+
+   def testRemovedFile(self):
+      old = self._mk_wav('a/track-alpha.wav')
+      self._parse_file('track-alpha.wav')
+      os.remove(old)
+      self.assertRaises( FileNotFoundError, self._parse_file,
+                         'track-alpha.wav')
+
+
+class CueLogDecodeTests(unittest.TestCase):
+   """Unit tests for decoding EAC log file data."""
+   _TEXT = '\u00c9xactAudioCopy\r\n     1  |  0:00.00 |  4:09.24 |'
+
+   def setUp(self):
+      self.csm = _CueStateMachine(None, os.curdir)
+
+   def testDecodeUtf8(self):
+      raw = self._TEXT.encode('utf-8')
+      self.assertEqual( self.csm._decode_log(raw), self._TEXT)
+
+   def testDecodeUtf8Bom(self):
+      raw = codecs.BOM_UTF8 + self._TEXT.encode('utf-8')
+      self.assertEqual( self.csm._decode_log(raw), self._TEXT)
+
+   def testDecodeUtf16Bom(self):
+      raw = self._TEXT.encode('utf-16')
+      self.assertEqual( self.csm._decode_log(raw), self._TEXT)
+
+   def testDecodeDetected(self):
+      """Data that is not UTF-8 must still be decoded, the exact non-ASCII
+      characters depend on the detected encoding."""
+      raw = self._TEXT.encode('latin-1')
+      self.assertTrue( self.csm._decode_log(raw).endswith(self._TEXT[1:]) )
+
+
 class WavParserTests(unittest.TestCase):
    def testWavFiles(self):
       """WavParser class must instantiate without errors."""
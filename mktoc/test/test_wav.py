@@ -95,6 +95,20 @@ class WavFileCacheTests(unittest.TestCase):
       wc = WavFileCache(self._WAV_DIR)
       self.assertRaises( TooManyFilesMatchError, wc, 'My Test File-3.wav')
 
+   def testExactNamePreferredMatch(self):
+      """A source name that exactly matches one file name must be found, even
+      if it is also a substring of other files."""
+      wc = WavFileCache()
+      wc._data = ['/a/My Test File.wav', '/b/Text My Test File.wav']
+      self.assertEqual( wc('My Test File.wav'), '/a/My Test File.wav')
+
+   def testFailExactNameInManyDirs(self):
+      """A source name that exactly matches files in multiple dirs should
+      raise an exception."""
+      wc = WavFileCache()
+      wc._data = ['/a/My Test File.wav', '/b/My Test File.wav']
+      self.assertRaises( TooManyFilesMatchError, wc, 'My Test File.wav')
+
    def testUnicodeFileNameMatch(self):
       """A unicode file should be matched correctly."""
       wc = WavFileCache()
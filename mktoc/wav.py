@@ -46,6 +46,10 @@ class WavFileCache(object):
    # list of WAV files found in the local file system.
    _data = None
 
+   # dictionary to map lower-case WAV file names to the path of the file in
+   # '_data'. Names found in more than one location map to None.
+   _index = None
+
    # base search path location.
    _src_dir = None
 
@@ -84,8 +88,13 @@ class WavFileCache(object):
       if self._WAV_REGEX.search(tmp_name) and os.path.exists(tmp_name):
          log.debug('-> FOUND\n'+'-'*5)
          return file_       # return match
-      # case 2: file is locatable in path by stripping directories
+      # case 2: file name exactly matches a single file in the cache
       fn = os.path.basename(tmp_name)     # strip leading path
+      path = self._get_index().get( fn.strip().lower() )
+      if path:
+         log.debug("--> FOUND '%s'" % path)
+         return path
+      # case 3: file is locatable in path by fuzzy matching the name
       fn = os.path.splitext(fn)[0]        # strip extension
       fn = fn.strip()                     # strip any whitespace
       log.debug("-> looking for file '%s'", os.sep + fn + '.wav')
@@ -125,6 +134,19 @@ class WavFileCache(object):
          self._init_cache()
       return self._data
 
+   def _get_index(self):
+      """
+      Helper function used to lookup the WAV file name index. The first call
+      to this method will cause the creation of the index.
+      """
+      if self._index is None:
+         self._index = {}
+         for path in self._get_cache():
+            name = os.path.basename(path).lower()
+            # do not allow duplicate names to match
+            self._index[name] = None if name in self._index else path
+      return self._index
+
    def _init_cache(self):
       """
       Create a list of WAV files in the vicinity of the current working dir.